@@ -9,7 +9,6 @@ from __future__ import annotations
 
 import argparse
 import asyncio
-import json
 import os
 import sys
 from pathlib import Path
@@ -23,90 +22,230 @@ except ImportError as exc:  # pragma: no cover - run-time dependency check
         "python -m pip install -r requirements.txt"
     ) from exc
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional accelerator
+    import json
+
+    def _dumps(payload: dict[str, Any]) -> bytes:
+        return (json.dumps(payload, separators=(",", ":")) + "\n").encode("utf-8")
+
+    _loads = json.loads
+else:
+
+    def _dumps(payload: dict[str, Any]) -> bytes:
+        return orjson.dumps(payload) + b"\n"
+
+    _loads = orjson.loads
+
 DEFAULT_PROTOCOL_VERSION = "2025-03-26"
 DEFAULT_CLIENT_NAME = "docx-mcp-inspect"
 DEFAULT_CLIENT_VERSION = "0.1.0"
 
 
+def initialize_params(protocol: str) -> dict[str, Any]:
+    return {
+        "protocolVersion": protocol,
+        "capabilities": {},
+        "clientInfo": {"name": DEFAULT_CLIENT_NAME, "version": DEFAULT_CLIENT_VERSION},
+    }
+
+
+# The handshake frames are constant unless --protocol overrides the version, so
+# serialize them once at import time.
+_INITIALIZE_ID = 1
+_DEFAULT_INITIALIZE_FRAME = _dumps(
+    {
+        "jsonrpc": "2.0",
+        "id": _INITIALIZE_ID,
+        "method": "initialize",
+        "params": initialize_params(DEFAULT_PROTOCOL_VERSION),
+    }
+)
+_INITIALIZED_FRAME = _dumps({"jsonrpc": "2.0", "method": "notifications/initialized"})
+
+
+_DEFAULT_EXE = "docx-mcpd.exe" if os.name == "nt" else "docx-mcpd"
+_DEFAULT_BINARY = Path("target") / "debug" / _DEFAULT_EXE
+
+
 def default_command() -> list[str]:
-    exe = "docx-mcpd.exe" if os.name == "nt" else "docx-mcpd"
-    candidate = Path("target") / "debug" / exe
-    if candidate.exists():
-        return [str(candidate)]
+    if _DEFAULT_BINARY.exists():
+        return [str(_DEFAULT_BINARY)]
     return ["cargo", "run", "-q", "-p", "docx-mcpd"]
 
 
 class JsonRpcClient:
-    def __init__(
-        self,
-        reader: asyncio.StreamReader,
-        writer: asyncio.StreamWriter,
-        timeout: float,
-        show_raw: bool,
-    ) -> None:
-        self._reader = reader
-        self._writer = writer
+    def __init__(self, timeout: float, show_raw: bool) -> None:
+        self._writer: asyncio.StreamWriter | None = None
         self._timeout = timeout
         self._show_raw = show_raw
         self._next_id = 1
+        self._buffer = bytearray()
+        self._closed = False
+        self._pending: dict[int, asyncio.Future[dict[str, Any]]] = {}
+
+    def connect(self, writer: asyncio.StreamWriter) -> None:
+        self._writer = writer
 
     async def request(self, method: str, params: dict[str, Any] | None) -> dict[str, Any]:
+        payload = self.build_request(method, params)
+        await self._send_request(payload)
+        return await self.response(payload["id"])
+
+    async def send_prebuilt(self, frame: bytes, expected_id: int) -> dict[str, Any]:
+        if expected_id < self._next_id:
+            raise RuntimeError(f"request id {expected_id} is already in use")
+        self._register(expected_id)
+        assert self._writer is not None
+        self._writer.write(frame)
+        await self._writer.drain()
+        return await self.response(expected_id)
+
+    def build_request(self, method: str, params: dict[str, Any] | None) -> dict[str, Any]:
         request_id = self._next_id
-        self._next_id += 1
+        self._register(request_id)
         payload: dict[str, Any] = {"jsonrpc": "2.0", "id": request_id, "method": method}
         if params is not None:
             payload["params"] = params
-        await self._send(payload)
-        while True:
-            message = await self._read_message()
-            if message.get("id") == request_id:
-                return message
-
-    async def notify(self, method: str, params: dict[str, Any] | None = None) -> None:
-        payload: dict[str, Any] = {"jsonrpc": "2.0", "method": method}
-        if params is not None:
-            payload["params"] = params
-        await self._send(payload)
+        return payload
 
-    async def _send(self, payload: dict[str, Any]) -> None:
-        data = json.dumps(payload, separators=(",", ":")) + "\n"
-        self._writer.write(data.encode("utf-8"))
+    async def response(self, request_id: int) -> dict[str, Any]:
+        future = self._pending[request_id]
+        try:
+            return await asyncio.wait_for(future, timeout=self._timeout)
+        except asyncio.TimeoutError as exc:
+            raise RuntimeError("timed out waiting for MCP response") from exc
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def send_batch(self, frames: list[dict[str, Any] | bytes]) -> None:
+        assert self._writer is not None
+        self._writer.write(
+            b"".join(frame if isinstance(frame, bytes) else _dumps(frame) for frame in frames)
+        )
         await self._writer.drain()
 
-    async def _read_message(self) -> dict[str, Any]:
-        while True:
-            try:
-                line = await asyncio.wait_for(self._reader.readline(), timeout=self._timeout)
-            except asyncio.TimeoutError as exc:
-                raise RuntimeError("timed out waiting for MCP response") from exc
+    def _register(self, request_id: int) -> None:
+        if self._closed:
+            raise RuntimeError("MCP server closed the connection")
+        self._next_id = request_id + 1
+        self._pending[request_id] = asyncio.get_running_loop().create_future()
+
+    async def _send_request(self, payload: dict[str, Any]) -> None:
+        assert self._writer is not None
+        self._writer.write(_dumps(payload))
+        await self._writer.drain()
 
-            if not line:
-                raise RuntimeError("MCP server closed the connection")
+    def feed_data(self, data: bytes) -> None:
+        # Server stdout is pushed here directly by the transport, and complete
+        # frames are dispatched inline. The trailing partial frame stays
+        # buffered, and the buffer is only re-split when a chunk actually
+        # completes a frame, so a large frame arriving over many reads is not
+        # rescanned on every read.
+        self._buffer += data
+        if b"\n" not in data:
+            return
+        lines = self._buffer.split(b"\n")
+        self._buffer = lines.pop()
+        for line in lines:
+            self._dispatch_line(line)
+
+    def feed_eof(self) -> None:
+        self._closed = True
+        error = RuntimeError("MCP server closed the connection")
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    def _dispatch_line(self, line: bytearray) -> None:
+        # Both JSON decoders accept bytes and skip leading whitespace, so the
+        # line is only trimmed of its trailing "\r" and never decoded.
+        raw = line.rstrip()
+        if not raw:
+            return
 
-            raw = line.decode("utf-8", errors="replace").strip()
-            if not raw:
-                continue
+        try:
+            message = _loads(raw)
+        except ValueError:
+            if self._show_raw:
+                sys.stderr.buffer.write(b"[non-json] " + raw + b"\n")
+                sys.stderr.buffer.flush()
+            return
+        if not isinstance(message, dict):
+            return
 
-            try:
-                return json.loads(raw)
-            except json.JSONDecodeError:
-                if self._show_raw:
-                    print(f"[non-json] {raw}", file=sys.stderr)
-                continue
+        # Only int/str ids can match a pending request; anything else (such as
+        # a list) is unhashable and is treated as unmatched.
+        request_id = message.get("id")
+        future = None
+        if isinstance(request_id, (int, str)):
+            future = self._pending.get(request_id)
+        if future is None:
+            # Notifications and responses nobody is waiting for are dropped.
+            if self._show_raw:
+                sys.stderr.buffer.write(b"[unmatched] " + raw + b"\n")
+                sys.stderr.buffer.flush()
+        elif not future.done():
+            future.set_result(message)
+
+
+class _ServerProcessProtocol(asyncio.subprocess.SubprocessStreamProtocol):
+    # Hands server stdout straight to the JSON-RPC client, and server stderr
+    # straight to ours (or nowhere), instead of staging either in a
+    # StreamReader first. stdin keeps the regular stream wiring.
+    def __init__(
+        self,
+        client: JsonRpcClient,
+        loop: asyncio.AbstractEventLoop,
+        show_stderr: bool,
+    ) -> None:
+        # SubprocessStreamProtocol requires a limit for the StreamReaders it
+        # creates; stdout and stderr never reach them, so asyncio's default is used.
+        super().__init__(limit=2**16, loop=loop)
+        self._client = client
+        self._stderr = sys.stderr.buffer if show_stderr else None
+
+    def pipe_data_received(self, fd: int, data: bytes) -> None:
+        if fd == 1:
+            self._client.feed_data(data)
+        elif self._stderr is not None:
+            self._stderr.write(data)
+            self._stderr.flush()
+
+    def pipe_connection_lost(self, fd: int, exc: Exception | None) -> None:
+        if fd == 1:
+            self._client.feed_eof()
+        super().pipe_connection_lost(fd, exc)
+
+
+async def spawn_server(
+    client: JsonRpcClient,
+    cmd: str,
+    cmd_args: list[str],
+    env: dict[str, str] | None,
+    show_stderr: bool,
+) -> asyncio.subprocess.Process:
+    loop = asyncio.get_running_loop()
+    transport, protocol = await loop.subprocess_exec(
+        lambda: _ServerProcessProtocol(client, loop, show_stderr),
+        cmd,
+        *cmd_args,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env=env,
+    )
+    proc = asyncio.subprocess.Process(transport, protocol, loop)
+    assert proc.stdin is not None
+    client.connect(proc.stdin)
+    return proc
 
 
 def extract_tool_names(response: dict[str, Any]) -> list[str]:
     result = response.get("result", {})
     tools = result.get("tools", []) if isinstance(result, dict) else []
-    names: list[str] = []
-    for tool in tools:
-        if isinstance(tool, dict):
-            name = tool.get("name")
-        else:
-            name = getattr(tool, "name", None)
-        if name:
-            names.append(name)
-    return names
+    return [tool["name"] for tool in tools if isinstance(tool, dict) and tool.get("name")]
 
 
 def extract_health_text(response: dict[str, Any]) -> str | None:
@@ -116,12 +255,16 @@ def extract_health_text(response: dict[str, Any]) -> str | None:
     content = result.get("content", [])
     if not isinstance(content, list):
         return None
-    for item in content:
-        if isinstance(item, dict) and item.get("type") == "text":
-            text = item.get("text")
-            if isinstance(text, str):
-                return text
-    return None
+    return next(
+        (
+            item["text"]
+            for item in content
+            if isinstance(item, dict)
+            and item.get("type") == "text"
+            and isinstance(item.get("text"), str)
+        ),
+        None,
+    )
 
 
 def extract_capability_names(response: dict[str, Any]) -> list[str]:
@@ -135,14 +278,6 @@ def extract_capability_names(response: dict[str, Any]) -> list[str]:
     return names
 
 
-async def drain_stderr(stream: asyncio.StreamReader) -> None:
-    while True:
-        line = await stream.readline()
-        if not line:
-            return
-        sys.stderr.write(line.decode("utf-8", errors="replace"))
-
-
 async def run_inspection(args: argparse.Namespace) -> int:
     command = args.command or default_command()
     cmd = command[0]
@@ -151,32 +286,41 @@ async def run_inspection(args: argparse.Namespace) -> int:
     if cmd == "cargo":
         print("note: using cargo; build output on stdout will be ignored", file=sys.stderr)
 
-    proc = await asyncio.create_subprocess_exec(
+    client = JsonRpcClient(args.timeout, args.show_raw)
+    proc = await spawn_server(
+        client,
         cmd,
-        *cmd_args,
-        stdin=asyncio.subprocess.PIPE,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-        env=build_env(args.env),
+        cmd_args,
+        build_env(args.env),
+        args.show_stderr,
     )
 
-    assert proc.stdin is not None
-    assert proc.stdout is not None
-    assert proc.stderr is not None
-
-    stderr_task = None
-    if args.show_stderr:
-        stderr_task = asyncio.create_task(drain_stderr(proc.stderr))
-
-    client = JsonRpcClient(proc.stdout, proc.stdin, args.timeout, args.show_raw)
     try:
-        init_params = {
-            "protocolVersion": args.protocol,
-            "capabilities": {},
-            "clientInfo": {"name": DEFAULT_CLIENT_NAME, "version": DEFAULT_CLIENT_VERSION},
-        }
-        init_response = await client.request("initialize", init_params)
-        await client.notify("notifications/initialized")
+        if args.protocol == DEFAULT_PROTOCOL_VERSION:
+            init_response = await client.send_prebuilt(
+                _DEFAULT_INITIALIZE_FRAME,
+                _INITIALIZE_ID,
+            )
+        else:
+            init_response = await client.request(
+                "initialize",
+                initialize_params(args.protocol),
+            )
+
+        # The server has answered initialize, so the initialized notification and
+        # the follow-up requests can go out together in one write.
+        tools_request = client.build_request("tools/list", {})
+        health_request = client.build_request(
+            "tools/call",
+            {"name": "health", "arguments": {}},
+        )
+        await client.send_batch(
+            [
+                _INITIALIZED_FRAME,
+                tools_request,
+                health_request,
+            ]
+        )
 
         server_info = init_response.get("result", {}).get("serverInfo", {})
         if isinstance(server_info, dict):
@@ -192,14 +336,13 @@ async def run_inspection(args: argparse.Namespace) -> int:
         capability_names = extract_capability_names(init_response)
         print(f"capabilities ({len(capability_names)}): {', '.join(capability_names)}")
 
-        tools_response = await client.request("tools/list", {})
+        tools_response, health_response = await asyncio.gather(
+            client.response(tools_request["id"]),
+            client.response(health_request["id"]),
+        )
         tool_names = extract_tool_names(tools_response)
         print(f"tools ({len(tool_names)}): {', '.join(tool_names)}")
 
-        health_response = await client.request(
-            "tools/call",
-            {"name": "health", "arguments": {}},
-        )
         health_text = extract_health_text(health_response)
         print(f"health: {health_text or '<no text>'}")
 
@@ -229,23 +372,26 @@ async def run_inspection(args: argparse.Namespace) -> int:
     finally:
         if proc.stdin:
             proc.stdin.close()
-        proc.terminate()
+        try:
+            proc.terminate()
+        except ProcessLookupError:
+            pass
         try:
             await asyncio.wait_for(proc.wait(), timeout=5)
         except asyncio.TimeoutError:
             proc.kill()
-        if stderr_task:
-            stderr_task.cancel()
 
 
-def build_env(overrides: list[str]) -> dict[str, str]:
-    env = dict(os.environ)
+def build_env(overrides: list[str]) -> dict[str, str] | None:
+    env: dict[str, str] = {}
     for item in overrides:
-        if "=" not in item:
-            continue
-        key, value = item.split("=", 1)
-        env[key] = value
-    return env
+        key, sep, value = item.partition("=")
+        if sep:
+            env[key] = value
+    if not env:
+        # env=None lets the subprocess inherit our environment without a copy.
+        return None
+    return {**os.environ, **env}
 
 
 def parse_args() -> argparse.Namespace:
@@ -298,7 +444,7 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--show-raw",
         action="store_true",
-        help="Print non-JSON stdout lines from the server.",
+        help="Print non-JSON and unmatched stdout lines from the server.",
     )
     parser.add_argument(
         "--show-stderr",
@@ -310,8 +456,6 @@ def parse_args() -> argparse.Namespace:
 
 def main() -> int:
     args = parse_args()
-    if args.command is None:
-        args.command = default_command()
     return asyncio.run(run_inspection(args))
 
 
@@ -0,0 +1,79 @@
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import mcp_inspect  # noqa: E402
+
+
+def frame(request_id: int, result: object) -> bytes:
+    return mcp_inspect._dumps({"jsonrpc": "2.0", "id": request_id, "result": result})
+
+
+class JsonRpcClientFramingTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.client = mcp_inspect.JsonRpcClient(timeout=1.0, show_raw=False)
+
+    async def test_frame_split_across_chunks(self) -> None:
+        request = self.client.build_request("tools/list", {})
+        data = frame(request["id"], {"tools": []})
+
+        self.client.feed_data(data[:10])
+        self.client.feed_data(data[10:-1])
+        self.client.feed_data(data[-1:])
+
+        response = await self.client.response(request["id"])
+        self.assertEqual(response["result"], {"tools": []})
+
+    async def test_several_frames_in_one_chunk(self) -> None:
+        first = self.client.build_request("tools/list", {})
+        second = self.client.build_request("tools/call", {})
+
+        self.client.feed_data(frame(second["id"], "b") + frame(first["id"], "a"))
+
+        self.assertEqual((await self.client.response(first["id"]))["result"], "a")
+        self.assertEqual((await self.client.response(second["id"]))["result"], "b")
+
+    async def test_crlf_line_endings(self) -> None:
+        request = self.client.build_request("tools/list", {})
+
+        self.client.feed_data(frame(request["id"], "ok").replace(b"\n", b"\r\n"))
+
+        self.assertEqual((await self.client.response(request["id"]))["result"], "ok")
+
+    async def test_non_json_lines_are_skipped(self) -> None:
+        request = self.client.build_request("tools/list", {})
+
+        self.client.feed_data(b"   Compiling docx-mcpd\n\n42\n" + frame(request["id"], "ok"))
+
+        self.assertEqual((await self.client.response(request["id"]))["result"], "ok")
+
+    async def test_unhashable_id_is_unmatched(self) -> None:
+        request = self.client.build_request("tools/list", {})
+
+        unhashable = b'{"jsonrpc":"2.0","id":[1],"result":"bad"}\n'
+        self.client.feed_data(unhashable + frame(request["id"], "ok"))
+
+        self.assertEqual((await self.client.response(request["id"]))["result"], "ok")
+
+    async def test_feed_eof_fails_pending_requests(self) -> None:
+        request = self.client.build_request("tools/list", {})
+
+        self.client.feed_eof()
+
+        with self.assertRaisesRegex(RuntimeError, "closed the connection"):
+            await self.client.response(request["id"])
+        with self.assertRaisesRegex(RuntimeError, "closed the connection"):
+            self.client.build_request("tools/list", {})
+
+    async def test_send_prebuilt_rejects_used_id(self) -> None:
+        request = self.client.build_request("tools/list", {})
+
+        with self.assertRaisesRegex(RuntimeError, "already in use"):
+            await self.client.send_prebuilt(b"{}\n", request["id"])
+
+
+if __name__ == "__main__":
+    unittest.main()
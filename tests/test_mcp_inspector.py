@@ -8,30 +8,33 @@ ROOT = Path(__file__).resolve().parents[1]
 SCRIPT = ROOT / "mcp_inspect.py"
 
 
+def setUpModule() -> None:
+    # Build once for the whole module; cargo decides what is stale and is a
+    # no-op when nothing changed.
+    try:
+        build = subprocess.run(
+            ["cargo", "build", "-q", "-p", "docx-mcpd"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            timeout=600,
+            check=False,
+        )
+    except subprocess.TimeoutExpired as exc:
+        raise AssertionError("cargo build timed out") from exc
+
+    if build.returncode != 0:
+        sys.stderr.write(build.stdout)
+        sys.stderr.write(build.stderr)
+        raise AssertionError("cargo build failed")
+
+
 class McpInspectorTest(unittest.TestCase):
     def test_stdio_health(self) -> None:
         env = dict(os.environ)
         env.setdefault("DOCX_MCP_HTTP_ADDR", "127.0.0.1:0")
         env.setdefault("DOCX_INGEST_ADDR", "127.0.0.1:0")
 
-        try:
-            build = subprocess.run(
-                ["cargo", "build", "-q", "-p", "docx-mcpd"],
-                cwd=ROOT,
-                env=env,
-                capture_output=True,
-                text=True,
-                timeout=600,
-                check=False,
-            )
-        except subprocess.TimeoutExpired as exc:
-            raise AssertionError("cargo build timed out") from exc
-
-        if build.returncode != 0:
-            sys.stderr.write(build.stdout)
-            sys.stderr.write(build.stderr)
-            raise AssertionError("cargo build failed")
-
         command = [
             sys.executable,
             str(SCRIPT),